@@ -0,0 +1,54 @@
+"""
+Heart rate mapping shared by the fan controller and the servo test
+Keeps the heart rate range, the servo position mapping and the display
+text in one place so main.py and servo_test.py cannot drift apart.
+"""
+
+MIN_HEART_RATE = 80
+MAX_HEART_RATE = 150
+MIN_SERVO_POS = -1.0
+MAX_SERVO_POS = 1.0
+
+HR_SPAN_RECIP = 1.0 / (MAX_HEART_RATE - MIN_HEART_RATE)
+_SCALE = (MAX_SERVO_POS - MIN_SERVO_POS) * HR_SPAN_RECIP
+_INVERSE_SCALE = (MAX_HEART_RATE - MIN_HEART_RATE) / (MAX_SERVO_POS - MIN_SERVO_POS)
+
+def hr_to_pos(heart_rate):
+    """Convert heart rate to servo position: -1.0 (80 BPM) to 1.0 (150 BPM)"""
+    hr_clamped = min(MAX_HEART_RATE, max(MIN_HEART_RATE, heart_rate))
+    return MIN_SERVO_POS + (hr_clamped - MIN_HEART_RATE) * _SCALE
+
+# Heart rates are whole BPM, so the whole mapping fits in a small table
+HR_TO_POS = tuple(hr_to_pos(hr) for hr in range(MIN_HEART_RATE, MAX_HEART_RATE + 1))
+_HR_MAX_INDEX = len(HR_TO_POS) - 1
+
+def heart_rate_to_servo_position(heart_rate):
+    """Look up the servo position for the nearest whole heart rate"""
+    return HR_TO_POS[max(0, min(_HR_MAX_INDEX, round(heart_rate) - MIN_HEART_RATE))]
+
+def servo_position_to_heart_rate(servo_position):
+    """Convert servo position back to heart rate"""
+    return MIN_HEART_RATE + (servo_position - MIN_SERVO_POS) * _INVERSE_SCALE
+
+def format_heart_rate(hr):
+    """Render a heart rate for the 4-digit display"""
+    return f" {hr} " if hr < 100 else f"{hr} "
+
+# The display only ever shows a few dozen distinct values, render them once
+_HR_STRINGS = {hr: format_heart_rate(hr) for hr in range(MIN_HEART_RATE, MAX_HEART_RATE + 1)}
+
+def display_text(heart_rate, connected=True):
+    """Pick the 4-character text to show for a heart rate"""
+    if not connected:
+        return " NA "
+    
+    # Mapped heart rates are the common case, check the table first
+    hr = int(heart_rate)
+    text = _HR_STRINGS.get(hr)
+    if text is not None:
+        return text
+    if heart_rate <= 0:
+        return "----"
+    if heart_rate >= 1000:
+        return " HI "
+    return format_heart_rate(hr)
@@ -16,14 +16,29 @@ Hardware Setup:
 - Colmi R02: Bluetooth connection
 """
 
+import os
+import re
 import time
 import json
+import select
+import asyncio
 import logging
+import logging.handlers
 import subprocess
-import RPi.GPIO as GPIO
-from gpiozero import Servo
-from gpiozero.pins.pigpio import PiGPIOFactory
+import pigpio
 import tm1637
+from hr_map import MIN_SERVO_POS, MAX_SERVO_POS, heart_rate_to_servo_position, display_text
+
+try:
+    from bleak import BleakClient
+except ImportError:
+    BleakClient = None
+
+try:
+    from dbus_fast import BusType, Message, Variant
+    from dbus_fast.aio import MessageBus
+except ImportError:
+    MessageBus = None
 
 COLMI_ADDRESS = "5B:62:EE:DA:AD:40"
 SERVO_PIN = 18
@@ -31,71 +46,376 @@ DISPLAY_CLK_PIN = 17
 DISPLAY_DIO_PIN = 27
 UPDATE_INTERVAL = 90
 MAX_CONSECUTIVE_FAILURES = 3
+HR_DEADBAND = 2
+BLE_CONNECT_TIMEOUT = 30
+HR_READ_TIMEOUT = 2
+HR_READ_RETRIES = 20
+SUBPROCESS_TIMEOUT = 60
+
+BLUEZ_SERVICE = "org.bluez"
+ADAPTER_PATH = "/org/bluez/hci0"
+DEVICE_PATH = f"{ADAPTER_PATH}/dev_{COLMI_ADDRESS.replace(':', '_')}"
+ADAPTER_OFF_TIME = 0.5
+# Without D-Bus, power cycle the radio with a single sudo invocation
+RFKILL_RESET_CMD = ["sudo", "sh", "-c", f"rfkill block bluetooth && sleep {ADAPTER_OFF_TIME} && rfkill unblock bluetooth"]
+
+# Colmi R02 UART service: commands are written to RX, readings arrive on TX
+CMD_CHAR_UUID = "6E400002-B5A3-F393-E0A9-E50E24DCCA9E"
+HR_CHAR_UUID = "6E400003-B5A3-F393-E0A9-E50E24DCCA9E"
+CMD_START_REAL_TIME = 105
+REAL_TIME_HEART_RATE = 1
+ACTION_START = 1
+ACTION_CONTINUE = 3
 
-MIN_HEART_RATE = 80
-MAX_HEART_RATE = 150
-MIN_SERVO_POS = -1.0
-MAX_SERVO_POS = 1.0
+SERVO_MIN_PULSE_US = 500
+SERVO_MAX_PULSE_US = 2500
+_PULSE_SCALE = (SERVO_MAX_PULSE_US - SERVO_MIN_PULSE_US) / (MAX_SERVO_POS - MIN_SERVO_POS)
+
+# Ease the servo between targets instead of slamming the throttle
+SERVO_EASE_TIME = 0.5
+SERVO_EASE_RATE_HZ = 50
+SERVO_EASE_INTERVAL = 1 / SERVO_EASE_RATE_HZ
+# Cubic 3s^2 - 2s^3 on [0, 1]: zero velocity at both ends, scaled by each move's distance
+_EASE_STEPS = round(SERVO_EASE_TIME * SERVO_EASE_RATE_HZ)
+_EASE = tuple(3 * s * s - 2 * s * s * s for s in (i / _EASE_STEPS for i in range(1, _EASE_STEPS + 1)))
 
 # Setup logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+log_file = logging.handlers.RotatingFileHandler('./logs/heartrate_fan.log', maxBytes=256*1024, backupCount=3, delay=True)
+log_file.setFormatter(logging.Formatter(LOG_FORMAT))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('./logs/heartrate_fan.log'),
+        # Batch info records to spare the SD card; warnings and errors flush straight away
+        logging.handlers.MemoryHandler(capacity=32, flushLevel=logging.WARNING, target=log_file),
         logging.StreamHandler()
     ]
 )
 
-GPIO.setmode(GPIO.BCM)
-GPIO.setwarnings(False)
+logger = logging.getLogger(__name__)
+
+def make_packet(command, payload=b""):
+    """Build a 16 byte Colmi packet: command, payload, checksum"""
+    packet = bytearray(16)
+    packet[0] = command
+    packet[1:1 + len(payload)] = payload
+    packet[15] = sum(packet[:15]) & 0xFF
+    return packet
+
+def parse_heart_rate_output(output):
+    """Return the last reading from colmi_r02_client's '[87, 88]' output, or None"""
+    end = output.rfind(']')
+    start = output.rfind('[', 0, end)
+    if start == -1 or end == -1:
+        return None
+    
+    last = output[start + 1:end].rsplit(',', 1)[-1].strip()
+    if last.isdigit():
+        return int(last)
+    
+    # Anything other than a plain integer list goes through the full parser
+    try:
+        hr_values = json.loads(output[start:end + 1])
+    except ValueError:
+        return None
+    return hr_values[-1] if hr_values else None
+
+_HR_LINE = re.compile(r'^\[\d+(?:,\s*\d+)*\]$')
+
+def read_first_heart_rate(cmd, timeout):
+    """Run cmd until it prints a heart rate list; return (heart_rate, stderr)"""
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + timeout
+    heart_rate = None
+    pending = b""
+    errors = []
+    # Drain stderr as well, a full pipe would otherwise stall the client
+    streams = [process.stdout, process.stderr]
+    
+    try:
+        while heart_rate is None and process.stdout in streams:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            
+            ready, _, _ = select.select(streams, [], [], remaining)
+            
+            if process.stderr in ready:
+                chunk = os.read(process.stderr.fileno(), 4096)
+                if chunk:
+                    errors.append(chunk)
+                else:
+                    streams.remove(process.stderr)
+            
+            if process.stdout not in ready:
+                continue
+            
+            # Raw reads so select never misses lines sitting in a Python buffer
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if chunk:
+                *lines, pending = (pending + chunk).split(b"\n")
+            else:
+                lines, pending = [pending], b""
+                streams.remove(process.stdout)
+            
+            for line in lines:
+                line = line.decode(errors="replace").strip()
+                if _HR_LINE.match(line):
+                    heart_rate = parse_heart_rate_output(line)
+                    break
+    finally:
+        # The client can linger after printing; stop it as soon as we have a reading
+        if process.poll() is None:
+            process.terminate()
+        try:
+            _, stderr = process.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            _, stderr = process.communicate()
+        errors.append(stderr)
+    
+    return heart_rate, b"".join(errors).decode(errors="replace")
 
 class HeartRateFanController:
     def __init__(self):
-        factory = PiGPIOFactory()
-        self.servo = Servo(SERVO_PIN, min_pulse_width=0.5/1000, max_pulse_width=2.5/1000, pin_factory=factory)
+        self._pi = pigpio.pi()
+        if not self._pi.connected:
+            raise RuntimeError("Could not connect to pigpiod - is the daemon running?")
+        self._pi.set_mode(SERVO_PIN, pigpio.OUTPUT)
         self.display = tm1637.TM1637(clk=DISPLAY_CLK_PIN, dio=DISPLAY_DIO_PIN)
         self.running = True
         self.current_heart_rate = 0
-        self.current_servo_pos = 0
+        # Last position written to the servo, including the steps of an ease
+        self.current_servo_pos = MIN_SERVO_POS
+        self._ease_task = None
+        self._last_hr = None
+        self._last_hr_shown = False
         self.display_connected = True
+        self._last_shown = None
+        self._last_segments = None
+        self._display_state = (0, True)
+        self._display_status = None
         self.consecutive_failures = 0
+        self._client = None
+        self._bus = None
+        self._ring_watched = False
+        # asyncio events are created in run() so they belong to its loop
+        self._hr_event = None
+        self._disconnected = None
+        self._display_dirty = None
+        self._wake = None
+        self._reset_lock = None
         
-        self.servo.min()
+        self.set_servo(MIN_SERVO_POS)
         
         try:
             self.display.brightness(3)
-            self.display.show("----")
+            self.show_text("----")
             time.sleep(1)
-            self.display.show("INIT")
-            logging.info("Display initialized successfully")
+            self.show_text("INIT")
+            logger.info("Display initialized successfully")
         except Exception as e:
-            logging.warning(f"Display initialization failed: {e}")
+            logger.warning("Display initialization failed: %s", e)
             self.display_connected = False
         
-        # Reset Bluetooth at startup
-        self.reset_bluetooth()
-        
-        logging.info("Heart Rate Fan Controller initialized")
+        logger.info("Heart Rate Fan Controller initialized")
     
-    def reset_bluetooth(self):
+    async def run(self):
+        self._hr_event = asyncio.Event()
+        self._display_dirty = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._disconnected = asyncio.Event()
+        self._reset_lock = asyncio.Lock()
+        
+        # The display task runs first so the startup reset can show its status
+        tasks = [asyncio.create_task(self._display_refresh_task())]
         try:
-            logging.info("Attempting to reset Bluetooth adapter...")
-            self.display.show(" BT ")
+            # Reset Bluetooth at startup
+            await self.start_dbus()
+            await self.reset_bluetooth()
+            await self.start_ble()
+            await self.watch_ring_connection()
             
-            subprocess.run(["sudo", "hciconfig", "hci0", "down"], check=True)
-            time.sleep(2)
+            logger.info("Starting heart rate monitoring...")
+            tasks.append(asyncio.create_task(self._hr_notify_task()))
+            tasks.append(asyncio.create_task(self._dbus_monitor_task()))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.close_bluetooth()
+    
+    async def start_ble(self):
+        if BleakClient is None:
+            logger.warning("bleak not installed - falling back to colmi_r02_client")
+            return False
+        
+        self._client = BleakClient(COLMI_ADDRESS)
+        try:
+            await asyncio.wait_for(self._connect_ble(), timeout=BLE_CONNECT_TIMEOUT)
+            logger.info("Subscribed to ring heart rate notifications")
+            return True
+        except Exception as e:
+            logger.warning("BLE connection failed: %s - will retry on next reading", e)
+            return False
+    
+    async def _connect_ble(self):
+        await self._client.connect()
+        await self._client.start_notify(HR_CHAR_UUID, self._on_hr)
+        await self._send_real_time(ACTION_START)
+    
+    async def _send_real_time(self, action):
+        packet = make_packet(CMD_START_REAL_TIME, bytes([REAL_TIME_HEART_RATE, action]))
+        await self._client.write_gatt_char(CMD_CHAR_UUID, packet, response=False)
+    
+    def _on_hr(self, _, data):
+        # [cmd, reading type, error code, value, ...]
+        if len(data) < 4 or data[0] != CMD_START_REAL_TIME or data[1] != REAL_TIME_HEART_RATE:
+            return
+        if data[2] != 0 or data[3] == 0:
+            return
+        
+        self.current_heart_rate = data[3]
+        self._hr_event.set()
+    
+    async def _wait_for_heart_rate(self):
+        if not self._client.is_connected:
+            await asyncio.wait_for(self._connect_ble(), timeout=BLE_CONNECT_TIMEOUT)
+            # BlueZ has no device object for a ring that was out of range at startup
+            if not self._ring_watched:
+                await self.watch_ring_connection()
+        
+        self._hr_event.clear()
+        for _ in range(HR_READ_RETRIES):
+            try:
+                await asyncio.wait_for(self._hr_event.wait(), timeout=HR_READ_TIMEOUT)
+                return self.current_heart_rate
+            except asyncio.TimeoutError:
+                await self._send_real_time(ACTION_CONTINUE)
+        
+        return None
+    
+    async def start_dbus(self):
+        if MessageBus is None:
+            logger.warning("dbus-fast not installed - falling back to rfkill")
+            return False
+        
+        try:
+            self._bus = await asyncio.wait_for(MessageBus(bus_type=BusType.SYSTEM).connect(), timeout=5)
+            return True
+        except Exception as e:
+            logger.warning("D-Bus connection failed: %s - falling back to rfkill", e)
+            return False
+    
+    async def watch_ring_connection(self):
+        if self._bus is None:
+            return False
+        
+        try:
+            await asyncio.wait_for(self._watch_device(), timeout=5)
+            logger.info("Watching ring connection state over D-Bus")
+            return True
+        except Exception as e:
+            logger.warning("Could not watch ring over D-Bus: %s - counting failures instead", e)
+            return False
+    
+    async def _watch_device(self):
+        introspection = await self._bus.introspect(BLUEZ_SERVICE, DEVICE_PATH)
+        device = self._bus.get_proxy_object(BLUEZ_SERVICE, DEVICE_PATH, introspection)
+        properties = device.get_interface("org.freedesktop.DBus.Properties")
+        properties.on_properties_changed(self._on_device_properties_changed)
+        self._ring_watched = True
+    
+    def _on_device_properties_changed(self, interface, changed, invalidated):
+        if interface != "org.bluez.Device1" or "Connected" not in changed:
+            return
+        
+        if changed["Connected"].value:
+            self._disconnected.clear()
+        elif self._reset_lock.locked():
+            # Power cycling the adapter drops the ring; that is not a new disconnect
+            return
+        else:
+            logger.warning("Ring disconnected")
+            self._disconnected.set()
+            self._wake.set()
+    
+    async def _set_adapter_powered(self, powered):
+        reply = await self._bus.call(Message(
+            destination=BLUEZ_SERVICE,
+            path=ADAPTER_PATH,
+            interface="org.freedesktop.DBus.Properties",
+            member="Set",
+            signature="ssv",
+            body=["org.bluez.Adapter1", "Powered", Variant("b", powered)]
+        ))
+        if reply.error_name:
+            raise RuntimeError(f"{reply.error_name}: {reply.body}")
+    
+    async def reset_bluetooth(self):
+        async with self._reset_lock:
+            self.set_display_status(" BT ")
+            try:
+                reset = await self._reset_adapter()
+            finally:
+                self.set_display_status(None)
+            self._disconnected.clear()
+            return reset
+    
+    async def _reset_adapter(self):
+        try:
+            logger.info("Attempting to reset Bluetooth adapter...")
             
-            subprocess.run(["sudo", "hciconfig", "hci0", "up"], check=True)
-            time.sleep(2)
+            if self._bus is not None:
+                # Adapter1 has no Reset method; power cycling it is the D-Bus equivalent
+                await asyncio.wait_for(self._set_adapter_powered(False), timeout=5)
+                await asyncio.sleep(ADAPTER_OFF_TIME)
+                await asyncio.wait_for(self._set_adapter_powered(True), timeout=5)
+            else:
+                process = await asyncio.create_subprocess_exec(*RFKILL_RESET_CMD)
+                if await process.wait() != 0:
+                    raise RuntimeError(f"rfkill reset exited with {process.returncode}")
             
-            logging.info("Bluetooth adapter reset complete")
+            logger.info("Bluetooth adapter reset complete")
             return True
         except Exception as e:
-            logging.error(f"Failed to reset Bluetooth: {e}")
+            logger.error("Failed to reset Bluetooth: %s", e)
             return False
     
-    def get_heart_rate(self):
+    async def close_bluetooth(self):
+        if self._client is not None:
+            try:
+                await asyncio.wait_for(self._client.disconnect(), timeout=5)
+            except Exception:
+                pass
+        
+        if self._bus is not None:
+            self._bus.disconnect()
+    
+    async def get_heart_rate(self):
+        if self._client is None:
+            # The client blocks for up to SUBPROCESS_TIMEOUT, keep it off the event loop
+            return await asyncio.to_thread(self._get_heart_rate_subprocess)
+        
+        try:
+            heart_rate = await self._wait_for_heart_rate()
+        except Exception as e:
+            logger.warning("BLE heart rate reading failed: %s", e)
+            heart_rate = None
+        
+        if heart_rate is None:
+            self.consecutive_failures += 1
+            return None
+        
+        self.consecutive_failures = 0
+        return heart_rate
+    
+    def _get_heart_rate_subprocess(self):
+        # colmi_r02_client has no streaming mode, so each reading is a fresh
+        # connect; the persistent connection lives in the BleakClient path instead
         try:
             cmd = [
                 "colmi_r02_client",
@@ -103,140 +423,198 @@ class HeartRateFanController:
                 "get-real-time-heart-rate"
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            heart_rate, stderr = read_first_heart_rate(cmd, SUBPROCESS_TIMEOUT)
             
-            if result.returncode == 0:
-                output_lines = result.stdout.strip().split('\n')
-                for line in output_lines:
-                    if line.startswith('[') and line.endswith(']'):
-                        hr_values = json.loads(line)
-                        if hr_values:
-                            self.consecutive_failures = 0
-                            return hr_values[-1]
+            if heart_rate is not None:
+                self.consecutive_failures = 0
+                return heart_rate
             
             # Check for specific error conditions
-            if "BleakDeviceNotFoundError" in result.stderr:
-                logging.warning("Ring not found - will retry immediately")
+            if "BleakDeviceNotFoundError" in stderr:
+                logger.warning("Ring not found - will retry immediately")
                 self.consecutive_failures += 1
                 return None
-            elif "BleakError: Not connected" in result.stderr:
-                logging.warning("Bluetooth connection lost - will retry immediately")
+            elif "BleakError: Not connected" in stderr:
+                logger.warning("Bluetooth connection lost - will retry immediately")
                 self.consecutive_failures += 1
                 return None
-            elif "TimeoutError" in result.stderr:
-                logging.warning("Reading timed out - will retry immediately")
+            elif "TimeoutError" in stderr:
+                logger.warning("Reading timed out - will retry immediately")
                 self.consecutive_failures += 1
                 return None
                 
-            logging.warning(f"Failed to get heart rate: {result.stderr}")
+            logger.warning("Failed to get heart rate: %s", stderr)
             self.consecutive_failures += 1
             return None
             
         except subprocess.TimeoutExpired:
-            logging.error("Heart rate reading timed out")
+            logger.error("Heart rate reading timed out")
             self.consecutive_failures += 1
             return None
         except Exception as e:
-            logging.error(f"Error getting heart rate: {e}")
+            logger.error("Error getting heart rate: %s", e)
             self.consecutive_failures += 1
             return None
     
-    def heart_rate_to_servo_position(self, heart_rate):
-        hr_clamped = max(MIN_HEART_RATE, min(MAX_HEART_RATE, heart_rate))
-        hr_normalized = (hr_clamped - MIN_HEART_RATE) / (MAX_HEART_RATE - MIN_HEART_RATE)
-        # Map to servo range: -1.0 (80 BPM) to 1.0 (150 BPM)
-        return -1.0 + (hr_normalized * 2.0)
+    def show_text(self, text):
+        if text == self._last_shown:
+            return
+        
+        segments = self.display.encode_string(text)[:4]
+        if self._last_segments is None or len(segments) != len(self._last_segments):
+            self.display.write(segments)
+        else:
+            # Rewrite only the span of digits that changed
+            changed = [i for i, seg in enumerate(segments) if seg != self._last_segments[i]]
+            if changed:
+                first, last = changed[0], changed[-1]
+                self.display.write(segments[first:last + 1], pos=first)
+        
+        self._last_shown = text
+        self._last_segments = segments
     
     def update_display(self, heart_rate, connected=True):
         if not self.display_connected: return
             
         try:
-            if not connected:
-                self.display.show(" NA ")
-            elif heart_rate > 0:
-                if heart_rate >= 1000:
-                    self.display.show(" HI ")
-                else:
-                    hr = int(heart_rate)
-                    if hr < 100:
-                        self.display.show(f" {hr} ")
-                    else:
-                        self.display.show(f"{hr} ")
-            else:
-                self.display.show("----")
-                
+            self.show_text(display_text(heart_rate, connected))
         except Exception as e:
-            logging.warning(f"Display update failed: {e}")
+            logger.warning("Display update failed: %s", e)
+    
+    def refresh_display(self, heart_rate, connected=True):
+        # Rendering happens in _display_refresh_task so bit-banging never delays a reading
+        self._display_state = (heart_rate, connected)
+        self._last_hr_shown = connected and heart_rate > 0
+        if self._display_dirty is not None:
+            self._display_dirty.set()
+    
+    def set_display_status(self, text):
+        # Status text such as " BT " stays up over heart rate updates until cleared
+        self._display_status = text
+        if self._display_dirty is not None:
+            self._display_dirty.set()
+    
+    def set_servo(self, position):
+        pulse_width = SERVO_MIN_PULSE_US + (position - MIN_SERVO_POS) * _PULSE_SCALE
+        self._pi.set_servo_pulsewidth(SERVO_PIN, round(pulse_width))
+        self.current_servo_pos = position
+    
+    async def _ease_servo(self, target):
+        start = self.current_servo_pos
+        distance = target - start
+        for step in _EASE:
+            self.set_servo(start + distance * step)
+            await asyncio.sleep(SERVO_EASE_INTERVAL)
     
     def update_fan_speed(self, heart_rate):
-        servo_pos = self.heart_rate_to_servo_position(heart_rate)
+        # Ignore resting jitter of a beat or so, unless the display needs restoring
+        if (self._last_hr is not None and abs(heart_rate - self._last_hr) < HR_DEADBAND
+                and self._last_hr_shown):
+            return False
         
-        if abs(servo_pos - self.current_servo_pos) > 0.1:
-            self.servo.value = servo_pos
-            self.current_servo_pos = servo_pos
-            logging.info(f"Heart rate: {heart_rate:.1f} BPM -> Servo position: {servo_pos:.2f}")
+        self._last_hr = heart_rate
+        servo_pos = heart_rate_to_servo_position(heart_rate)
         
-        self.update_display(heart_rate, connected=True)
-    
-    def monitor_heart_rate(self):
-        logging.info("Starting heart rate monitoring...")
+        if servo_pos != self.current_servo_pos:
+            # A new target takes over from wherever the previous ease got to
+            if self._ease_task is not None:
+                self._ease_task.cancel()
+            self._ease_task = asyncio.create_task(self._ease_servo(servo_pos))
+            logger.info("Heart rate: %.1f BPM -> Servo position: %.2f", heart_rate, servo_pos)
         
+        self.refresh_display(heart_rate, connected=True)
+        return True
+    
+    async def wait(self, seconds):
+        # Returns early when a disconnect sets _wake
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+    
+    async def _hr_notify_task(self):
         while self.running:
             try:
-                heart_rate = self.get_heart_rate()
+                heart_rate = await self.get_heart_rate()
                 
                 if heart_rate is not None:
                     self.current_heart_rate = heart_rate
-                    self.update_fan_speed(heart_rate)
-                    logging.info(f"Heart Rate: {heart_rate}")
-                    time.sleep(UPDATE_INTERVAL)
+                    if self.update_fan_speed(heart_rate):
+                        logger.info("Heart Rate: %s", heart_rate)
+                    # Notifications pace the BLE path; only the subprocess fallback polls
+                    if self._client is None:
+                        await self.wait(UPDATE_INTERVAL)
                 else:
-                    logging.warning("No heart rate data received")
-                    self.update_display(0, connected=False)
+                    logger.warning("No heart rate data received")
+                    self.refresh_display(0, connected=False)
                     
+                    # _dbus_monitor_task resets on disconnect right away; this catches everything else
                     if self.consecutive_failures >= 2:
-                        if self.reset_bluetooth():
+                        if await self.reset_bluetooth():
                             self.consecutive_failures = 0
-                        time.sleep(5)
+                        await self.wait(5)
                     else:
-                        time.sleep(3)
+                        await self.wait(3)
                 
-            except KeyboardInterrupt:
-                logging.info("Shutdown requested by user")
-                self.stop()
-                break
             except Exception as e:
-                logging.error(f"Error in monitoring loop: {e}")
-                time.sleep(UPDATE_INTERVAL)
+                logger.error("Error in monitoring loop: %s", e)
+                await self.wait(UPDATE_INTERVAL)
+    
+    async def _dbus_monitor_task(self):
+        # _disconnected is only set once watch_ring_connection() has subscribed
+        while self.running:
+            await self._disconnected.wait()
+            if self._reset_lock.locked():
+                # A reset already under way covers this disconnect
+                async with self._reset_lock:
+                    continue
+            
+            self.refresh_display(0, connected=False)
+            # One reset per disconnect; failed reconnects fall back to failure counting
+            if await self.reset_bluetooth():
+                self.consecutive_failures = 0
+    
+    async def _display_refresh_task(self):
+        while self.running:
+            await self._display_dirty.wait()
+            self._display_dirty.clear()
+            if self._display_status is None:
+                self.update_display(*self._display_state)
+            elif self.display_connected:
+                try:
+                    self.show_text(self._display_status)
+                except Exception as e:
+                    logger.warning("Display update failed: %s", e)
     
     def stop(self):
         self.running = False
-        self.servo.min()
+        self.set_servo(MIN_SERVO_POS)
         
         if self.display_connected:
             try:
-                self.display.show("L8TR")
+                self.show_text("L8TR")
                 time.sleep(1)
-                self.display.show("    ")
+                self.show_text("    ")
             except:
                 pass
         
-        self.servo.close()
-        logging.info("Heart Rate Fan Controller stopped")
+        # A pulse width of 0 switches the servo signal off
+        self._pi.set_servo_pulsewidth(SERVO_PIN, 0)
+        self._pi.stop()
+        
+        logger.info("Heart Rate Fan Controller stopped")
 
 def main():
+    controller = None
     try:
         controller = HeartRateFanController()
-        controller.monitor_heart_rate()
+        asyncio.run(controller.run())
     except KeyboardInterrupt:
-        controller.stop()
+        logger.info("Shutdown requested by user")
     finally:
-        GPIO.cleanup()
+        if controller is not None:
+            controller.stop()
 
 if __name__ == "__main__":
     main()
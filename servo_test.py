@@ -7,64 +7,191 @@ Usage:
     python3 servo_test.py
 """
 
+import os
+import sys
 import time
+import asyncio
 from gpiozero import Servo
 from gpiozero.pins.pigpio import PiGPIOFactory
-import RPi.GPIO as GPIO
 import tm1637
+from hr_map import (
+    MIN_HEART_RATE, MAX_HEART_RATE, MIN_SERVO_POS, MAX_SERVO_POS, HR_TO_POS,
+    hr_to_pos, servo_position_to_heart_rate, display_text
+)
 
 SERVO_PIN = 18
 DISPLAY_CLK_PIN = 17
 DISPLAY_DIO_PIN = 27
 MIN_PULSE_WIDTH = 0.5/1000  # 0.5ms
 MAX_PULSE_WIDTH = 2.5/1000  # 2.5ms
+SWEEP_STEP_TIME = 0.25  # An SG90 covers one 5 BPM step well within this
+COMMAND_HOLD_TIME = 2  # Dwell between scripted commands so each position can be observed
+PROMPT = "Enter command: "
 
-# Heart rate mapping constants
-MIN_HEART_RATE = 80
-MAX_HEART_RATE = 150
-MIN_SERVO_POS = -1.0
-MAX_SERVO_POS = 1.0
+def servo_pulse_width(servo_position):
+    """Convert servo position to pulse width in seconds"""
+    return MIN_PULSE_WIDTH + (servo_position + 1.0) * (MAX_PULSE_WIDTH - MIN_PULSE_WIDTH) / 2.0
 
-def heart_rate_to_servo_position(heart_rate):
-    """Convert heart rate to servo position"""
-    hr_clamped = max(MIN_HEART_RATE, min(MAX_HEART_RATE, heart_rate))
-    hr_normalized = (hr_clamped - MIN_HEART_RATE) / (MAX_HEART_RATE - MIN_HEART_RATE)
-    return -1.0 + (hr_normalized * 2.0)
-
-def servo_position_to_heart_rate(servo_position):
-    """Convert servo position back to heart rate"""
-    hr_normalized = (servo_position + 1.0) / 2.0
-    heart_rate = MIN_HEART_RATE + (hr_normalized * (MAX_HEART_RATE - MIN_HEART_RATE))
-    return heart_rate
+# (heart rate, servo position, pulse width) for each step of the 'r' sweep
+_SWEEP = tuple(
+    (hr, HR_TO_POS[hr - MIN_HEART_RATE], servo_pulse_width(HR_TO_POS[hr - MIN_HEART_RATE]))
+    for hr in range(MIN_HEART_RATE, MAX_HEART_RATE + 1, 5)
+)
 
 def update_display(display, heart_rate, connected=True):
     """Update the TM1637 display with heart rate"""
-    if not connected: return
-        
     try:
-        if not connected:
-            display.show(" NA ")
-        elif heart_rate > 0:
-            if heart_rate >= 1000:
-                display.show(" HI ")
-            else:
-                hr = int(heart_rate)
-                if hr < 100:
-                    display.show(f" {hr} ")
-                else:
-                    display.show(f"{hr} ")
-        else:
-            display.show("----")
-            
+        display.show(display_text(heart_rate, connected))
     except Exception as e:
         print(f"Display update failed: {e}")
 
+async def read_stdin_lines(commands):
+    """Blocking fallback for stdin that cannot be watched, e.g. a redirected file"""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            line = await loop.run_in_executor(None, input)
+        except EOFError:
+            commands.put_nowait(None)
+            return
+        commands.put_nowait(line)
+
+def watch_stdin(commands):
+    """Feed each line typed on stdin into the commands queue, None on EOF; returns a stop function"""
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    pending = b""
+    
+    def on_readable():
+        nonlocal pending
+        chunk = os.read(fd, 1024)
+        if not chunk:
+            loop.remove_reader(fd)
+            # A last command without a trailing newline still counts
+            if pending:
+                commands.put_nowait(pending.decode(errors="replace"))
+            commands.put_nowait(None)
+            return
+        
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            commands.put_nowait(line.decode(errors="replace"))
+    
+    try:
+        loop.add_reader(fd, on_readable)
+    except (OSError, ValueError):
+        # epoll refuses regular files, so fall back to input() in a thread
+        reader = asyncio.create_task(read_stdin_lines(commands))
+        return reader.cancel
+    
+    return lambda: loop.remove_reader(fd)
+
+async def run_sweep(servo, display, display_connected):
+    """Step the servo through the heart rate range"""
+    print("Running through heart rate range...")
+    for hr, servo_pos, pulse_width in _SWEEP:
+        servo.value = servo_pos
+        
+        print(f"Heart Rate: {hr} BPM -> Servo: {servo_pos:.2f} (pulse: {pulse_width*1000:.1f}ms)")
+        
+        if display_connected:
+            update_display(display, hr)
+        
+        await asyncio.sleep(SWEEP_STEP_TIME)
+
+async def run_commands(servo, display, display_connected):
+    """Apply commands as they are typed; a new command interrupts a running sweep"""
+    commands = asyncio.Queue()
+    stop_watching = watch_stdin(commands)
+    # Commands from a file or pipe run one after another, like the old input() loop
+    interactive = sys.stdin.isatty()
+    sweep = None
+    
+    def prompt_after_sweep(task):
+        if not task.cancelled():
+            print(PROMPT, end="", flush=True)
+    
+    try:
+        while True:
+            if sweep is None or sweep.done():
+                print(PROMPT, end="", flush=True)
+            line = await commands.get()
+            if line is None:
+                # Let a sweep started by the last command run to the end
+                if sweep is not None:
+                    await sweep
+                break
+            user_input = line.strip().lower()
+            
+            if sweep is not None and not sweep.done():
+                sweep.cancel()
+                sweep = None
+                print("Sweep stopped")
+                # 'q' during a sweep only stops the sweep
+                if user_input == 'q':
+                    continue
+            
+            if user_input == 'q':
+                break
+            elif user_input == 'r':
+                sweep = asyncio.create_task(run_sweep(servo, display, display_connected))
+                if interactive:
+                    sweep.add_done_callback(prompt_after_sweep)
+                else:
+                    await sweep
+                    sweep = None
+            elif user_input.startswith('h '):
+                try:
+                    heart_rate = float(user_input[2:])
+                    if heart_rate < MIN_HEART_RATE or heart_rate > MAX_HEART_RATE:
+                        print(f"Heart rate must be between {MIN_HEART_RATE} and {MAX_HEART_RATE} BPM")
+                        continue
+                    
+                    servo_pos = hr_to_pos(heart_rate)
+                    servo.value = servo_pos
+                    
+                    pulse_width = servo_pulse_width(servo_pos)
+                    
+                    print(f"Heart Rate: {heart_rate:.1f} BPM -> Servo: {servo_pos:.2f} (pulse: {pulse_width*1000:.1f}ms)")
+                    
+                    if display_connected:
+                        update_display(display, heart_rate)
+                    
+                    if not interactive:
+                        await asyncio.sleep(COMMAND_HOLD_TIME)
+                except ValueError:
+                    print("Invalid heart rate. Use format 'h 75'")
+            else:
+                try:
+                    position = float(user_input)
+                    
+                    if position < -1.0 or position > 1.0:
+                        print("Position must be between -1.0 and 1.0")
+                        continue
+                    
+                    servo.value = position
+                    
+                    heart_rate = servo_position_to_heart_rate(position)
+                    
+                    pulse_width = servo_pulse_width(position)
+                    
+                    print(f"Servo: {position:.2f} -> Heart Rate: {heart_rate:.1f} BPM (pulse: {pulse_width*1000:.1f}ms)")
+                    
+                    if display_connected:
+                        update_display(display, heart_rate)
+                    
+                    if not interactive:
+                        await asyncio.sleep(COMMAND_HOLD_TIME)
+                except ValueError:
+                    print("Invalid input. Please enter a number between -1.0 and 1.0, 'h <heart_rate>', 'r', or 'q'")
+    finally:
+        stop_watching()
+        if sweep is not None:
+            sweep.cancel()
+
 def test_servo():
     """Test the servo at custom positions with heart rate display"""
     
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setwarnings(False)
-    
     factory = PiGPIOFactory()
     servo = Servo(
         SERVO_PIN, 
@@ -100,78 +227,14 @@ def test_servo():
     print("  Enter servo position (-1.0 to 1.0)")
     print("  Enter 'h' followed by heart rate (e.g., 'h 75')")
     print("  Enter 'q' to quit")
-    print("  Enter 'r' to run through heart rate range")
+    print("  Enter 'r' to run through heart rate range ('q' or any command stops it)")
     print("=" * 60)
     
     try:
-        while True:
-            try:
-                user_input = input("Enter command: ").strip().lower()
-                
-                if user_input == 'q':
-                    break
-                elif user_input == 'r':
-                    print("Running through heart rate range...")
-                    for hr in range(MIN_HEART_RATE, MAX_HEART_RATE + 1, 5):
-                        servo_pos = heart_rate_to_servo_position(hr)
-                        servo.value = servo_pos
-                        
-                        pulse_width = MIN_PULSE_WIDTH + (servo_pos + 1.0) * (MAX_PULSE_WIDTH - MIN_PULSE_WIDTH) / 2.0
-                        
-                        print(f"Heart Rate: {hr} BPM -> Servo: {servo_pos:.2f} (pulse: {pulse_width*1000:.1f}ms)")
-                        
-                        if display_connected:
-                            update_display(display, hr)
-                        
-                        time.sleep(1)
-                    continue
-                elif user_input.startswith('h '):
-                    try:
-                        heart_rate = float(user_input[2:])
-                        if heart_rate < MIN_HEART_RATE or heart_rate > MAX_HEART_RATE:
-                            print(f"Heart rate must be between {MIN_HEART_RATE} and {MAX_HEART_RATE} BPM")
-                            continue
-                        
-                        servo_pos = heart_rate_to_servo_position(heart_rate)
-                        servo.value = servo_pos
-                        
-                        pulse_width = MIN_PULSE_WIDTH + (servo_pos + 1.0) * (MAX_PULSE_WIDTH - MIN_PULSE_WIDTH) / 2.0
-                        
-                        print(f"Heart Rate: {heart_rate:.1f} BPM -> Servo: {servo_pos:.2f} (pulse: {pulse_width*1000:.1f}ms)")
-                        
-                        if display_connected:
-                            update_display(display, heart_rate)
-                        
-                        time.sleep(2)
-                        continue
-                    except ValueError:
-                        print("Invalid heart rate. Use format 'h 75'")
-                        continue
-                else:
-                    try:
-                        position = float(user_input)
-                        
-                        if position < -1.0 or position > 1.0:
-                            print("Position must be between -1.0 and 1.0")
-                            continue
-                        
-                        servo.value = position
-                        
-                        heart_rate = servo_position_to_heart_rate(position)
-                        
-                        pulse_width = MIN_PULSE_WIDTH + (position + 1.0) * (MAX_PULSE_WIDTH - MIN_PULSE_WIDTH) / 2.0
-                        
-                        print(f"Servo: {position:.2f} -> Heart Rate: {heart_rate:.1f} BPM (pulse: {pulse_width*1000:.1f}ms)")
-                        
-                        if display_connected:
-                            update_display(display, heart_rate)
-                        
-                        time.sleep(2)
-                        
-                    except ValueError:
-                        print("Invalid input. Please enter a number between -1.0 and 1.0, 'h <heart_rate>', 'r', or 'q'")
-            except KeyboardInterrupt:
-                break
+        try:
+            asyncio.run(run_commands(servo, display, display_connected))
+        except KeyboardInterrupt:
+            pass
         
         print("Test completed!")
         
@@ -189,7 +252,6 @@ def test_servo():
                 time.sleep(1)
                 display.show("    ")
             
-            GPIO.cleanup()
             print("Cleanup completed")
         except:
             pass